@@ -1,8 +1,11 @@
 from collections import namedtuple
-import copy
+import math
 from typing import Dict, List, Tuple
 
 from .component import Component
+from .snapshot import Snapshot
+
+SECONDS_PER_DAY = 60 * 60 * 24
 
 
 def get_total_singles_rate(components: List[Component]) -> float:
@@ -21,7 +24,7 @@ def total_accidentals(
         prompt += comp.total_singles
         delayed += comp.del_singles
     total = prompt * delayed * ds * dt
-    return total * 60 * 60 * 24
+    return total * SECONDS_PER_DAY
 
 
 def total_bgr(
@@ -69,6 +72,15 @@ def maxbg(
     return maxB
 
 
+def maxbg_from_params(params: namedtuple) -> float:
+    return maxbg(params.signal,
+                 params.t3sigma,
+                 sigma=params.sigma,
+                 Ronoff=params.Ronoff,
+                 RN=params.radionuclides,
+                 FN=params.fastneutrons)
+
+
 def bg_ratio(
         components: List[Component],
         signal: float,
@@ -91,30 +103,24 @@ def inv_gradients(
         t3sigma: float,
         params: namedtuple
 ) -> Tuple[Dict[str, Dict[str, float]], float]:
-    # Need to copy components, adjust activity for a given isotope, calculate
-    # and then return components to original state
-    # Do not work on comp or components, only comps_copy
+    # Each what-if is a cheap derived snapshot of the base state, so the
+    # components themselves are never copied or mutated. The snapshot keeps
+    # the efficiencies from the last update, so components must already have
+    # been updated with these params.
+    base = Snapshot.from_components(components)
     gradients = {}
     norm = 0
     for idx, comp in enumerate(components):
-        comps_copy = copy.deepcopy(components)
         grad = {}
         for iso, iso_obj in comp.isotopes.items():
-            comps_copy[idx].activities[iso] = comp.activities[iso] * 0.5
-            comps_copy[idx].update(skip_activity=True, params=params)
-            # REPLACE THESE WITH CALCULATION AND USE PARAMS
-            y1 = bg_ratio(comps_copy, signal, t3sigma)
-            comps_copy[idx].activities[iso] = comp.activities[iso] * 1.5
-            comps_copy[idx].update(skip_activity=True, params=params)
-            # REPLACE THESE WITH CALCULATION AND USE PARAMS
-            y2 = bg_ratio(comps_copy, signal, t3sigma)
+            y1 = bg_ratio(base.scale_activity(idx, iso, 0.5), signal, t3sigma)
+            y2 = bg_ratio(base.scale_activity(idx, iso, 1.5), signal, t3sigma)
             if (y2 - y1) == 0:
                 grad[iso] = 0
                 norm += 0
             else:
                 grad[iso] = 1. / (y2 - y1)
                 norm += 1. / (y2 - y1)
-            comps_copy[idx].activities[iso] = comp.activities[iso]
         gradients[comp.name] = grad
     return gradients, norm
 
@@ -133,20 +139,17 @@ def inverse_scale(
     total = total_accidentals(components)
     sum_orig = 0
     sum_scaled = 0
+    # Components must already have been updated with these params, the
+    # snapshot reuses their efficiencies
+    base = Snapshot.from_components(components)
     for idx, comp in enumerate(components):
-        comps_copy = copy.deepcopy(components)
         iso_contribs = {}
         for iso, iso_obj in comp.isotopes.items():
-            comps_copy[idx].activities[iso] = comp.activities[iso] * 0
-            comps_copy[idx].update(skip_activity=True, params=params)
-            y1 = total_accidentals(comps_copy)
-            comps_copy[idx].activities[iso] = comp.activities[iso] * 1.0
-            comps_copy[idx].update(skip_activity=True, params=params)
-            y2 = total_accidentals(comps_copy)
+            y1 = total_accidentals(base.scale_activity(idx, iso, 0))
+            y2 = total_accidentals(base.scale_activity(idx, iso, 1.0))
             iso_contrib = (y2 - y1) / total
             sum_orig += iso_contrib
             iso_contribs[iso] = iso_contrib
-            comps_copy[idx].activities[iso] = comp.activities[iso]
         comp_contribs[comp.name] = iso_contribs
     denom = 0.
     for comp in comp_contribs:
@@ -167,6 +170,24 @@ def inverse_scale(
         comp_scaled_contribs[comp] = iso_scaled_contribs
 
 
+def _revised_component(
+        comp: Component,
+        revact: Dict[str, float],
+        params: namedtuple,
+        reuse_efficiencies: bool = True
+) -> Component:
+    if reuse_efficiencies:
+        return comp.derive(revact, params)
+    # Original path, rebuilds the component and rereads every efficiency
+    revcomp = Component(comp.name, comp.mass,
+                        rate_format=comp.rate_format, rfile=comp.rfile)
+    for iso, act in revact.items():
+        # type: ignore why does this trigger issue with type hints?
+        revcomp.add_isotope(iso, act)
+    revcomp.update(params=params)
+    return revcomp
+
+
 def budget(
         components: List[Component],
         signal: float,
@@ -175,7 +196,8 @@ def budget(
         totacc: float = 0,
         mbg: float = 0,
         method='e',
-        update: bool = False
+        update: bool = False,
+        reuse_efficiencies: bool = True
 ) -> List[Component]:
     revcomponents = []
     if not totacc:
@@ -196,22 +218,61 @@ def budget(
         for comp in components:
             bg_share = comp.share(mbg, totacc, scales=scales)
             revact = comp.revise_activity(bg_share, mbg/totacc)
-            revcomp = Component(comp.name, comp.mass,
-                                rate_format=comp.rate_format, rfile=comp.rfile)
-            for iso, act in revact.items():
-                # type: ignore [why does this trigger issue with type hints?]
-                revcomp.add_isotope(iso, act)
-            revcomp.update(params=params)
-            revcomponents.append(revcomp)
+            revcomponents.append(
+                _revised_component(comp, revact, params, reuse_efficiencies))
         return revcomponents
     for comp in components:
         bg_share = comp.share(mbg, totacc)
         revact = comp.revise_activity(bg_share, mbg/totacc)
-        revcomp = Component(comp.name, comp.mass,
-                            rate_format=comp.rate_format, rfile=comp.rfile)
-        for iso, act in revact.items():
-            # type: ignore why does this trigger issue with type hints?
-            revcomp.add_isotope(iso, act)
-        revcomp.update(params=params)
-        revcomponents.append(revcomp)
+        revcomponents.append(
+            _revised_component(comp, revact, params, reuse_efficiencies))
     return revcomponents
+
+
+def refine_budget(
+        components: List[Component],
+        signal: float,
+        t3sigma: float,
+        params: namedtuple,
+        max_rounds: int = 20,
+        method='e',
+        rtol: float = 1e-6
+) -> Tuple[List[Component], int]:
+    # Repeat budget() on its own output until the accidentals fit within
+    # maxbg. maxbg is already net of the FN, RN and reactor terms, so the
+    # target is accidentals <= maxbg rather than bg_ratio <= 1. Revised
+    # components share efficiencies with the originals so each round is pure
+    # arithmetic with no ROOT lookups. Method 'e' lands on maxbg in one
+    # round, only 'c' needs more.
+    # Returns the revised components and the number of rounds used, or an
+    # empty list if the target could not be reached.
+    mbg = maxbg_from_params(params._replace(signal=signal, t3sigma=t3sigma))
+    if mbg <= 0:
+        print("Not possible.")
+        return [], 0
+    revcomponents = components
+    totacc = total_accidentals(components)
+    if not 0 < totacc < math.inf:
+        print(f"Cannot budget from {totacc} accidentals per day.")
+        return [], 0
+    for rnd in range(1, max_rounds + 1):
+        revcomponents = budget(revcomponents, signal, t3sigma, params,
+                               totacc=totacc, mbg=mbg, method=method)
+        if not revcomponents:
+            return [], rnd
+        revacc = total_accidentals(revcomponents)
+        if not 0 < revacc < math.inf:
+            print(f"Budget diverged in round {rnd} "
+                  f"({revacc:.4e} accidentals per day).")
+            return [], rnd
+        if revacc <= mbg * (1 + rtol):
+            return revcomponents, rnd
+        if revacc >= totacc * (1 - rtol):
+            # Above maxbg and not decreasing, further rounds will not help
+            print(f"Budget stalled in round {rnd} at {revacc:.4e} "
+                  f"accidentals per day, above max background {mbg:.4e}.")
+            return [], rnd
+        totacc = revacc
+    print(f"Accidentals still above max background after {max_rounds} "
+          "rounds.")
+    return [], max_rounds
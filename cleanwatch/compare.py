@@ -0,0 +1,98 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from .budget import budget, maxbg_from_params, total_accidentals, total_bgr
+from .component import Component
+
+# Compare detector media side by side. The component and isotope definitions
+# are shared, only the efficiency file (and so the efficiencies) differ.
+
+MEDIA = {
+    "water": "results_Watchman_16m_water.root",
+    "WbLS": "results_Watchman_16m_WbLS.root",
+}
+
+
+def _for_medium(comp: Component, rfile: str) -> Component:
+    medcomp = Component(comp.name, comp.mass, region=comp.region,
+                        rate_format=comp.rate_format, fixed=comp.fixed,
+                        rfile=rfile)
+    medcomp.isotopes = dict(comp.isotopes)
+    medcomp.rates = dict(comp.rates)
+    return medcomp
+
+
+def evaluate_medium(
+        components: List[Component],
+        params: namedtuple,
+        rfile: str
+) -> Dict:
+    """Update components against rfile and return background, maxbg headroom
+    and revised budget rates for that medium"""
+    params = params._replace(rfile=rfile)
+    comps = [_for_medium(comp, rfile) for comp in components]
+    for comp in comps:
+        comp.update(params=params)
+    mbg = maxbg_from_params(params)
+    acc = total_accidentals(comps)
+    bgr = total_bgr(comps,
+                    RN=params.radionuclides,
+                    FN=params.fastneutrons,
+                    signal=params.signal)
+    revcomps = budget(comps, params.signal, params.t3sigma, params, mbg=mbg)
+    return {
+        "accidentals": acc,
+        "bgr": bgr,
+        "maxbg": mbg,
+        # maxbg is already net of FN, RN and reactor backgrounds, so the
+        # headroom is what is left for accidentals (the target of budget())
+        "headroom": mbg - acc,
+        "acc_ratio": acc / mbg if mbg > 0 else float("inf"),
+        "budget": {(comp.name, iso): rate
+                   for comp in revcomps for iso, rate in comp.rates.items()},
+    }
+
+
+def compare_media(
+        components: List[Component],
+        params: namedtuple,
+        media: Dict[str, str] = None,
+        workers: int = 1
+) -> Dict[str, Dict]:
+    """Evaluate every medium, in a process pool if workers > 1.
+
+    Pool workers use the default multiprocessing start method. Under spawn
+    or forkserver (macOS, and Linux from Python 3.14) each worker re-imports
+    the calling script, so it must guard its entry point with
+    if __name__ == "__main__".
+    """
+    media = media or MEDIA
+    if not workers or workers < 2 or len(media) < 2:
+        return {name: evaluate_medium(components, params, rfile)
+                for name, rfile in media.items()}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(evaluate_medium, components, params,
+                                     rfile)
+                   for name, rfile in media.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def comparison_table(results: Dict[str, Dict]) -> str:
+    names = list(results)
+    lines = [f"{'':>24}" + "".join(f"{name:>14}" for name in names)]
+    for key, label in (("accidentals", "Accidentals per day"),
+                       ("bgr", "Total background"),
+                       ("maxbg", "Max background"),
+                       ("headroom", "Headroom"),
+                       ("acc_ratio", "Accidentals / max")):
+        lines.append(f"{label:>24}"
+                     + "".join(f"{results[n][key]:>14.4e}" for n in names))
+    lines.append("\nRevised budget:")
+    keys = list(dict.fromkeys(key for n in names
+                              for key in results[n]["budget"]))
+    for comp, iso in keys:
+        lines.append(f"{comp + ' ' + iso:>24}"
+                     + "".join(f"{results[n]['budget'].get((comp, iso), float('nan')):>14.4e}"
+                               for n in names))
+    return "\n".join(lines)
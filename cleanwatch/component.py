@@ -59,6 +59,22 @@ class Component():
         self.calculate_accidentals(
             time_cut=params.IBDtimecut, space_cut=params.IBDspacecut)
 
+    def derive(self, rates: Dict[str, float], params: namedtuple) -> "Component":
+        # New component with revised rates. Isotopes and efficiencies are
+        # carried over (efficiencies only depend on name, isotope, rfile and
+        # cuts) so only the activities and downstream rates are recalculated.
+        comp = Component(self.name, self.mass, region=self.region,
+                         rate_format=self.rate_format, fixed=self.fixed,
+                         rfile=self.rfile)
+        comp.isotopes = dict(self.isotopes)
+        comp.rates = {iso: rates[iso] for iso in self.isotopes}
+        comp.efficiencies = self.efficiencies
+        comp.calculate_activity()
+        comp.calculate_singles()
+        comp.calculate_accidentals(
+            time_cut=params.IBDtimecut, space_cut=params.IBDspacecut)
+        return comp
+
     def calculate_activity(self) -> None:
         # Calculates activities for all isotopes registered with this
         # component. Assumes secular equilibrium for decay chains.
@@ -213,24 +229,26 @@ class Component():
             text += f"\n{iso}: {rate:.4e} {self.rate_format}"
         print(text)
 
-    def output(self):
-        text = ""
-        text += f"\n********************\nDetails for {self.name}:\n"
-        text += "********************\n"
-        text += f"\nRegistered isotopes: {list(self.isotopes.keys())}\n"
-        text += f"Total prompt singles rate: {self.total_singles:.4e} Hz\n"
-        text += "\nBreakdown of isotopes: \n"
+    def output_lines(self):
+        """Yield the formatted details report piece by piece"""
+        yield f"\n********************\nDetails for {self.name}:\n"
+        yield "********************\n"
+        yield f"\nRegistered isotopes: {list(self.isotopes.keys())}\n"
+        yield f"Total prompt singles rate: {self.total_singles:.4e} Hz\n"
+        yield "\nBreakdown of isotopes: \n"
         for iso, iso_obj in self.isotopes.items():
-            text += f"\n-----------{iso}{' chain' if iso_obj.chain else ''}----------\n"
-            text += f"\nActivity of {iso}{' chain' if iso_obj.chain else ''}: {self.activities[iso]:.4e} Bq\n"
-            text += f"\n    {'Chain details:' if iso_obj.chain else 'Details:'}\n    ---------\n"
+            yield f"\n-----------{iso}{' chain' if iso_obj.chain else ''}----------\n"
+            yield f"\nActivity of {iso}{' chain' if iso_obj.chain else ''}: {self.activities[iso]:.4e} Bq\n"
+            yield f"\n    {'Chain details:' if iso_obj.chain else 'Details:'}\n    ---------\n"
             for ch_iso in self.efficiencies[iso]:
-                text += f"    {ch_iso} prompt efficiency: {self.efficiencies[iso][ch_iso][0]:.4e}\n"
-            text += "\n"
+                yield f"    {ch_iso} prompt efficiency: {self.efficiencies[iso][ch_iso][0]:.4e}\n"
+            yield "\n"
             for ch_iso in self.singles[iso]:
-                text += f"    {ch_iso} prompt singles rate: {self.singles[iso][ch_iso][0]:.4e} Hz\n"
-        text += "\n--------------------\n"
-        return text
+                yield f"    {ch_iso} prompt singles rate: {self.singles[iso][ch_iso][0]:.4e} Hz\n"
+        yield "\n--------------------\n"
+
+    def output(self):
+        return "".join(self.output_lines())
 
     def __repr__(self):
         return f"{self.name} Component"
@@ -1,7 +1,10 @@
 import cmd
+import sys
 
 from .budget import *  # Terrible practice but will fix later
+from .compare import compare_media, comparison_table
 from .plotting import cb_plot
+from .report import export
 
 # The command line interface for cleanwatch
 
@@ -37,10 +40,18 @@ class Interface(cmd.Cmd):
         return
 
     def do_print(self, args):
-        text = ""
+        """Print details. Pass a .csv, .json, .md or .txt path to export"""
+        if args.strip():
+            try:
+                nrows = export(self.components, args.strip())
+            except (OSError, ValueError) as e:
+                print(f"Could not write report: {e}")
+                return
+            print(f"{nrows} rows written to {args.strip()}")
+            return
         for comp in self.components:
-            text += comp.output()
-        print(text)
+            sys.stdout.writelines(comp.output_lines())
+        print()
 
     def do_maxbg(self, args):
         while True:
@@ -75,13 +86,29 @@ class Interface(cmd.Cmd):
                 print("Invalid input.\n")
                 continue
             break
-        revcomponents = budget(self.components, signal,
-                               t3sigma, self.params, method=method)
+        revcomponents, rounds = refine_budget(self.components, signal,
+                                              t3sigma, self.params,
+                                              method=method)
+        if rounds > 1:
+            print(f"Budget refined over {rounds} rounds.")
         if revcomponents:
             print("\nRevised component activities:")
             for comp in revcomponents:
                 comp.revprint()
 
+    def do_compare(self, args):
+        """Compare media side by side. Optionally pass name=rfile pairs"""
+        media = None
+        if args.strip():
+            try:
+                media = dict(pair.split("=", 1) for pair in args.split())
+            except ValueError:
+                print("Invalid input. Use name=rfile pairs.\n")
+                return
+        results = compare_media(self.components, self.params, media=media,
+                                workers=1)
+        print(comparison_table(results))
+
     def do_bgr(self, args):
         print(total_bgr(self.components))
 
@@ -112,4 +139,8 @@ class Interface(cmd.Cmd):
         return
 
     def do_plot(self, args):
-        cb_plot(self.components, option='c')
+        """Plot breakdown. Pass a .png or .pdf path to write all components"""
+        try:
+            cb_plot(self.components, option='c', outfile=args.strip() or None)
+        except (OSError, ValueError) as e:
+            print(f"Could not write plot: {e}")
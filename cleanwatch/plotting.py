@@ -1,10 +1,124 @@
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+import math
+from typing import Dict, List, Sequence, Tuple
 
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
-def cb_plot(components, option: str = None) -> None:
+from .budget import SECONDS_PER_DAY
+
+FORMATS = ('png', 'pdf')
+
+
+def breakdown_data(components) -> Dict[str, Tuple[List[str], List[float]]]:
+    # Precompute per-isotope accidentals (per day) for every component so the
+    # figures can be built without touching the components again.
+    data = {}
+    for comp in components:
+        labels = []
+        values = []
+        total = comp.total_accidentals * SECONDS_PER_DAY
+        for iso in comp.isotopes:
+            value = sum(comp.accidentals[iso].values()) * SECONDS_PER_DAY
+            values.append(value)
+            share = value / total * 100 if total else 0.
+            labels.append(f"{iso}, {value:.2e} per day, {share:.1f}%")
+        data[comp.name] = (labels, values)
+    return data
+
+
+def check_outfile(outfile: str) -> None:
+    ext = outfile.rsplit('.', 1)[-1].lower() if '.' in outfile else ''
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported plot format for {outfile}. "
+                         f"Use one of {FORMATS}")
+
+
+def _save(fig: Figure, outfile: str) -> str:
+    # Agg canvas works without a display, format is taken from the extension
+    check_outfile(outfile)
+    FigureCanvasAgg(fig)
+    fig.savefig(outfile)
+    return outfile
+
+
+def plot_breakdowns(
+        data: Dict[str, Tuple[List[str], List[float]]],
+        outfile: str,
+        ncols: int = 3
+) -> str:
+    """Write a pie chart for every component to a single PNG or PDF file"""
+    names = list(data)
+    ncols = max(1, min(ncols, len(names)))
+    nrows = max(1, math.ceil(len(names) / ncols))
+    fig = Figure(figsize=(6 * ncols, 5 * nrows))
+    for idx, name in enumerate(names):
+        labels, values = data[name]
+        ax = fig.add_subplot(nrows, ncols, idx + 1)
+        ax.set_title(name)
+        if sum(values) > 0:
+            ax.pie(values, normalize=True, labels=labels,
+                   textprops={'fontsize': 7})
+        else:
+            ax.text(0.5, 0.5, "No accidentals", ha='center', va='center')
+            ax.set_axis_off()
+    fig.tight_layout()
+    return _save(fig, outfile)
+
+
+def plot_sweep(
+        x: Sequence[float],
+        curves: Dict[str, Sequence[float]],
+        outfile: str,
+        xlabel: str = "",
+        ylabel: str = "",
+        logy: bool = False
+) -> str:
+    """Write one or more precomputed sweep curves to a PNG or PDF file"""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot(1, 1, 1)
+    for label, y in curves.items():
+        ax.plot(x, y, label=label)
+    if logy:
+        ax.set_yscale('log')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if curves:
+        ax.legend()
+    fig.tight_layout()
+    return _save(fig, outfile)
+
+
+def _render(job: Tuple) -> str:
+    func, args, kwargs = job
+    return func(*args, **kwargs)
+
+
+def render_all(jobs: List[Tuple], processes: int = None) -> List[str]:
+    """Render (func, args, kwargs) plot jobs, in parallel if processes > 1.
+
+    Workers use the default multiprocessing start method. Under spawn or
+    forkserver (macOS, and Linux from Python 3.14) each worker re-imports
+    the calling script, so scripts must guard their entry point with
+    if __name__ == "__main__".
+    """
+    if not processes or processes < 2 or len(jobs) < 2:
+        return [_render(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_render, jobs))
+
+
+def cb_plot(components, option: str = None, outfile: str = None) -> None:
     if option == 'c':
         # Plot contribution breakdown
-        names = [comp.name for comp in components]
+        data = breakdown_data(components)
+        if outfile:
+            check_outfile(outfile)
+            plot_breakdowns(data, outfile)
+            print(f"Breakdown for all components written to {outfile}")
+            return
+        names = list(data)
         while True:
             choice = input(
                 f"Select component to plot. Choices: {names}\nChoice: ")
@@ -12,18 +126,14 @@ def cb_plot(components, option: str = None) -> None:
                 break
             elif choice in ['q', 'x', 'exit']:
                 return
-        for comp in components:
-            if comp.name.lower() == choice.lower():
-                user_comp = comp
-                break
-        data = []
-        labels = []
-        total = user_comp.total_accidentals * 60 * 60 * 24
-        for iso in user_comp.isotopes:
-            value = sum(user_comp.accidentals[iso].values()) * 60 * 60 * 24
-            data.append(value)
-            labels.append(
-                f"{iso}, {value:.2e} per day, {value/total*100:.1f}%")
-        plt.pie(data, normalize=True, labels=labels)
+        name = names[[name.lower() for name in names].index(choice.lower())]
+        labels, values = data[name]
+        import matplotlib.pyplot as plt
+        if matplotlib.get_backend().lower() == 'agg':
+            outfile = f"{name}_breakdown.png"
+            plot_breakdowns({name: (labels, values)}, outfile)
+            print(f"No display available, plot written to {outfile}")
+            return
+        plt.pie(values, normalize=True, labels=labels)
         plt.show()
         return
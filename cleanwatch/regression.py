@@ -0,0 +1,209 @@
+import json
+import sys
+import time
+from typing import Callable, Dict, List
+
+from .budget import (bg_ratio, budget, maxbg, maxbg_from_params,
+                     refine_budget, total_accidentals)
+from .defaults import get_16m_defaults, get_defaults
+from .snapshot import Snapshot
+
+# Golden-output harness. The reference engine is the original calculation
+# path (Component.update, total_accidentals, maxbg, bg_ratio, budget). Its
+# results for each default config are recorded to JSON and every alternative
+# engine is checked against them stage by stage.
+#
+# Run from the directory holding the ROOT files:
+#   python -m cleanwatch.regression record golden.json
+#   python -m cleanwatch.regression check golden.json
+#   python -m cleanwatch.regression refine
+
+CONFIGS = {
+    "defaults": get_defaults,
+    "16m": get_16m_defaults,
+}
+
+STAGES = ("update", "total_accidentals", "maxbg", "bg_ratio", "budget")
+
+# Stage functions take (components, params) and return {key: value}.
+# Components are always updated by the reference engine before the other
+# stages run.
+Engine = Dict[str, Callable]
+
+
+def _ref_update(components, params):
+    results = {}
+    for comp in components:
+        comp.update(params=params)
+        results[f"{comp.name}/total_singles"] = comp.total_singles
+        results[f"{comp.name}/del_singles"] = comp.del_singles
+        results[f"{comp.name}/total_accidentals"] = comp.total_accidentals
+    return results
+
+
+def _ref_budget(components, params, reuse_efficiencies=False):
+    revcomponents = budget(components, params.signal, params.t3sigma, params,
+                           reuse_efficiencies=reuse_efficiencies)
+    return {f"{comp.name}/{iso}": rate
+            for comp in revcomponents for iso, rate in comp.rates.items()}
+
+
+def _snapshot_total_accidentals(components, params):
+    return {"total": total_accidentals(Snapshot.from_components(components))}
+
+
+def _snapshot_bg_ratio(components, params):
+    snap = Snapshot.from_components(components)
+    return {"bg_ratio": bg_ratio(snap, params.signal, params.t3sigma)}
+
+
+def _scan_total_accidentals(components, params):
+    import numpy as np
+    from .scan import evaluate_chunk, singles_coefficients
+    prompt_eff, delayed_eff = singles_coefficients(components)
+    row = np.array([[comp.activities[iso] for comp in components
+                     for iso in comp.isotopes]])
+    acc, _ = evaluate_chunk(row, prompt_eff, delayed_eff,
+                            maxbg(params.signal, params.t3sigma))
+    return {"total": float(acc[0])}
+
+
+ENGINES: Dict[str, Engine] = {
+    "reference": {
+        "update": _ref_update,
+        "total_accidentals": lambda comps, params: {
+            "total": total_accidentals(comps)},
+        "maxbg": lambda comps, params: {
+            "maxbg": maxbg(params.signal, params.t3sigma)},
+        "bg_ratio": lambda comps, params: {
+            "bg_ratio": bg_ratio(comps, params.signal, params.t3sigma)},
+        "budget": _ref_budget,
+    },
+    "snapshot": {
+        "total_accidentals": _snapshot_total_accidentals,
+        "bg_ratio": _snapshot_bg_ratio,
+    },
+    "scan": {
+        "total_accidentals": _scan_total_accidentals,
+    },
+    "derived": {
+        "budget": lambda comps, params: _ref_budget(
+            comps, params, reuse_efficiencies=True),
+    },
+}
+
+
+def register_engine(name: str, stages: Engine) -> None:
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages for {name}: {unknown}")
+    ENGINES[name] = stages
+
+
+def _timed(func, components, params, repeats: int):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        values = func(components, params)
+        best = min(best, time.perf_counter() - start)
+    return values, best
+
+
+def run_engine(name: str, config: str, repeats: int = 1) -> Dict[str, Dict]:
+    """Run every stage an engine provides for config, returning
+    {stage: {"values": {...}, "time": seconds}}"""
+    components, params = CONFIGS[config]()
+    _ref_update(components, params)
+    results = {}
+    for stage in STAGES:
+        if stage not in ENGINES[name]:
+            continue
+        values, elapsed = _timed(ENGINES[name][stage], components, params,
+                                 repeats)
+        results[stage] = {"values": values, "time": elapsed}
+    return results
+
+
+def record(outfile: str, repeats: int = 1) -> None:
+    golden = {config: run_engine("reference", config, repeats)
+              for config in CONFIGS}
+    with open(outfile, "w") as f:
+        json.dump(golden, f, indent=1, sort_keys=True)
+    print(f"Reference values written to {outfile}")
+
+
+def check_refine(configs: List[str] = None, rtol: float = 1e-6) -> bool:
+    """budget() rescales accidentals onto maxbg in one step, so for method
+    'e' refine_budget must stop after the first round with accidentals
+    within maxbg"""
+    ok = True
+    print(f"{'config':>10} {'rounds':>7} {'acc/maxbg - 1':>14}  result")
+    for config in configs or list(CONFIGS):
+        components, params = CONFIGS[config]()
+        _ref_update(components, params)
+        mbg = maxbg_from_params(params)
+        revcomponents, rounds = refine_budget(
+            components, params.signal, params.t3sigma, params, method='e')
+        excess = (total_accidentals(revcomponents) - mbg) / mbg
+        passed = rounds == 1 and excess <= rtol
+        ok = ok and passed
+        print(f"{config:>10} {rounds:>7d} {excess:>14.3e}  "
+              f"{'ok' if passed else 'FAIL'}")
+    return ok
+
+
+def max_deviation(values: Dict[str, float], ref: Dict[str, float]) -> float:
+    # Largest relative deviation from the reference over all keys. A key
+    # missing from either side counts as an infinite deviation.
+    if set(values) != set(ref):
+        return float("inf")
+    dev = 0.
+    for key, rval in ref.items():
+        diff = abs(values[key] - rval)
+        dev = max(dev, diff / abs(rval) if rval else diff)
+    return dev
+
+
+def check(
+        goldfile: str,
+        engines: List[str] = None,
+        rtol: float = 1e-9,
+        repeats: int = 1
+) -> bool:
+    """Compare engines against recorded reference values. Prints speedup
+    and deviation per stage and returns True if every stage is within rtol"""
+    with open(goldfile) as f:
+        golden = json.load(f)
+    engines = engines or list(ENGINES)
+    ok = True
+    print(f"{'config':>10} {'engine':>12} {'stage':>18} {'speedup':>9} "
+          f"{'max rel dev':>12}  result")
+    for config, stages in golden.items():
+        # Time the reference again here so speedups are not skewed by the
+        # machine the golden file was recorded on
+        ref_times = run_engine("reference", config, repeats)
+        for name in engines:
+            results = run_engine(name, config, repeats)
+            for stage, result in results.items():
+                ref = stages[stage]
+                dev = max_deviation(result["values"], ref["values"])
+                speedup = (ref_times[stage]["time"] / result["time"]
+                           if result["time"] else float("inf"))
+                passed = dev <= rtol
+                ok = ok and passed
+                print(f"{config:>10} {name:>12} {stage:>18} {speedup:>9.2f} "
+                      f"{dev:>12.3e}  {'ok' if passed else 'FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["refine"]:
+        sys.exit(0 if check_refine() else 1)
+    if len(sys.argv) != 3 or sys.argv[1] not in ("record", "check"):
+        print("Usage: python -m cleanwatch.regression record|check FILE\n"
+              "       python -m cleanwatch.regression refine")
+        sys.exit(2)
+    if sys.argv[1] == "record":
+        record(sys.argv[2])
+    else:
+        sys.exit(0 if check(sys.argv[2]) else 1)
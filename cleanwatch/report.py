@@ -0,0 +1,110 @@
+import csv
+import json
+import sys
+from typing import Dict, Iterable, Iterator, List, TextIO
+
+from .component import Component
+
+# One row per (component, isotope, contributing isotope). Everything the text
+# report shows is collected here once and rendered by the writers below.
+FIELDS = ("component", "isotope", "contributor", "activity",
+          "prompt_eff", "delayed_eff", "prompt_singles", "delayed_singles",
+          "accidentals")
+
+UNITS = {"activity": "Bq", "prompt_singles": "Hz", "delayed_singles": "Hz",
+         "accidentals": "Hz"}
+
+FORMATS = ("text", "csv", "json", "markdown")
+
+
+def iter_rows(components: Iterable[Component], **extra) -> Iterator[Dict]:
+    """Yield report rows for updated components.
+
+    Keyword arguments are added as leading columns of every row, e.g. a sweep
+    index or medium name, so rows from several evaluations can share a file.
+    """
+    for comp in components:
+        for iso, iso_obj in comp.isotopes.items():
+            act = comp.activities[iso]
+            for ciso in iso_obj.contributors:
+                effs = comp.efficiencies[iso][ciso]
+                singles = comp.singles[iso][ciso]
+                row = dict(extra)
+                row.update(component=comp.name,
+                           isotope=iso,
+                           contributor=ciso,
+                           activity=act,
+                           prompt_eff=effs[0],
+                           delayed_eff=effs[1],
+                           prompt_singles=singles[0],
+                           delayed_singles=singles[1],
+                           accidentals=comp.accidentals[iso][ciso])
+                yield row
+
+
+def _header(name: str) -> str:
+    return f"{name} [{UNITS[name]}]" if name in UNITS else name
+
+
+def _cell(value) -> str:
+    return f"{value:.4e}" if isinstance(value, float) else str(value)
+
+
+def write_report(
+        rows: Iterable[Dict],
+        stream: TextIO = None,
+        fmt: str = "text"
+) -> int:
+    """Stream rows to stream (stdout by default) as text, csv, json or
+    markdown. Rows are written as they arrive. Returns the number of rows."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Report format {fmt} not recognised. "
+                         f"Choices: {FORMATS}")
+    stream = stream or sys.stdout
+    nrows = 0
+    fields: List[str] = []
+    writer = None
+    if fmt == "json":
+        stream.write("[")
+    for row in rows:
+        if not fields:
+            fields = list(row)
+            if fmt == "csv":
+                writer = csv.writer(stream)
+                writer.writerow([_header(f) for f in fields])
+            elif fmt == "markdown":
+                stream.write("| " + " | ".join(_header(f) for f in fields)
+                             + " |\n")
+                stream.write("|" + "---|" * len(fields) + "\n")
+            elif fmt == "text":
+                stream.write("  ".join(f"{_header(f):>16}" for f in fields)
+                             + "\n")
+        values = [row[f] for f in fields]
+        if fmt == "csv":
+            writer.writerow(values)
+        elif fmt == "json":
+            stream.write(("," if nrows else "") + "\n" + json.dumps(row))
+        elif fmt == "markdown":
+            stream.write("| " + " | ".join(_cell(v) for v in values) + " |\n")
+        else:
+            stream.write("  ".join(f"{_cell(v):>16}" for v in values) + "\n")
+        nrows += 1
+    if fmt == "json":
+        stream.write("\n]\n")
+    return nrows
+
+
+def export(
+        components: Iterable[Component],
+        outfile: str = None,
+        fmt: str = None
+) -> int:
+    """Write a report for components to outfile, or stdout if not given.
+    The format is taken from the file extension unless fmt is set."""
+    if fmt is None:
+        ext = outfile.rsplit(".", 1)[-1].lower() if outfile else "txt"
+        fmt = {"csv": "csv", "json": "json", "md": "markdown"}.get(ext, "text")
+    if not outfile:
+        return write_report(iter_rows(components), fmt=fmt)
+    with open(outfile, "w", newline="") as f:
+        return write_report(iter_rows(components), f, fmt=fmt)
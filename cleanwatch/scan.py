@@ -0,0 +1,154 @@
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .budget import SECONDS_PER_DAY, maxbg_from_params
+from .component import Component
+
+
+def scan_columns(components: List[Component]) -> List[Tuple[str, str]]:
+    """(component, isotope) pairs giving the column order of activity samples"""
+    return [(comp.name, iso) for comp in components for iso in comp.isotopes]
+
+
+def singles_coefficients(
+        components: List[Component]
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Prompt and delayed singles are linear in activity, so once the
+    # efficiencies are known each column only needs its summed efficiency.
+    # Components must have been updated so that efficiencies are filled.
+    prompt = []
+    delayed = []
+    for comp in components:
+        for iso in comp.isotopes:
+            effs = comp.efficiencies[iso].values()
+            prompt.append(sum(eff[0] for eff in effs))
+            delayed.append(sum(eff[1] for eff in effs))
+    return np.array(prompt), np.array(delayed)
+
+
+def iter_chunks(samples, chunksize: int = 100000) -> Iterator[np.ndarray]:
+    # Accepts anything indexable with a shape (np.memmap, np.ndarray) or an
+    # iterable that already yields 2D chunks.
+    if hasattr(samples, 'shape'):
+        for start in range(0, samples.shape[0], chunksize):
+            yield np.atleast_2d(
+                np.asarray(samples[start:start + chunksize], dtype=float))
+    else:
+        for chunk in samples:
+            yield np.atleast_2d(np.asarray(chunk, dtype=float))
+
+
+def evaluate_chunk(
+        chunk: np.ndarray,
+        prompt_eff: np.ndarray,
+        delayed_eff: np.ndarray,
+        maxb: float,
+        ds: float = 0.05,
+        dt: float = 0.0001,
+        RN: float = 0.034,
+        FN: float = 0.023,
+        signal: float = 0.485,
+        WRratio: float = 1.15
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Same arithmetic as total_accidentals and bg_ratio, one row per sample
+    prompt = chunk @ prompt_eff
+    delayed = chunk @ delayed_eff
+    acc = prompt * delayed * ds * dt * SECONDS_PER_DAY
+    bgr = acc + (WRratio * signal) + FN + RN
+    return acc, bgr / maxb
+
+
+class _ParquetWriter():
+
+    def __init__(self, outfile: str, columns: List[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing .parquet requires pyarrow") from e
+        self.pa = pa
+        self.columns = columns
+        fields = [pa.field(col, pa.float64()) for col in columns]
+        self.writer = pq.ParquetWriter(outfile, pa.schema(fields))
+
+    def write(self, arrays: List[np.ndarray]) -> None:
+        table = self.pa.table(dict(zip(self.columns, arrays)))
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HDF5Writer():
+
+    def __init__(self, outfile: str, columns: List[str]):
+        try:
+            import h5py
+        except ImportError as e:
+            raise ImportError("Writing .h5/.hdf5 requires h5py") from e
+        self.file = h5py.File(outfile, "w")
+        self.datasets = [self.file.create_dataset(
+            col, shape=(0,), maxshape=(None,), dtype='f8', chunks=True)
+            for col in columns]
+
+    def write(self, arrays: List[np.ndarray]) -> None:
+        for dset, arr in zip(self.datasets, arrays):
+            start = dset.shape[0]
+            dset.resize((start + len(arr),))
+            dset[start:] = arr
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _get_writer(outfile: str, columns: List[str]):
+    if outfile.endswith('.parquet'):
+        return _ParquetWriter(outfile, columns)
+    elif outfile.endswith(('.h5', '.hdf5')):
+        return _HDF5Writer(outfile, columns)
+    raise ValueError(f"Unrecognised output format for {outfile}. "
+                     "Use .parquet, .h5 or .hdf5")
+
+
+def stream_scan(
+        components: List[Component],
+        samples: Iterable,
+        outfile: str,
+        params,
+        chunksize: int = 100000,
+        write_activities: bool = True
+) -> int:
+    """Evaluate accidentals and bg_ratio for a large scan of activities.
+
+    samples holds activities in Bq, one row per scan point, with columns in
+    the order given by scan_columns(components). Results are appended to
+    outfile chunk by chunk so memory use does not grow with the scan size.
+    Returns the number of rows written.
+    """
+    prompt_eff, delayed_eff = singles_coefficients(components)
+    maxb = maxbg_from_params(params)
+    columns = []
+    if write_activities:
+        columns += [f"{comp}_{iso}" for comp, iso in scan_columns(components)]
+    columns += ["accidentals", "bg_ratio"]
+    writer = _get_writer(outfile, columns)
+    nrows = 0
+    try:
+        for chunk in iter_chunks(samples, chunksize):
+            if chunk.shape[1] != len(prompt_eff):
+                raise ValueError(
+                    f"Expected {len(prompt_eff)} activity columns, "
+                    f"got {chunk.shape[1]}")
+            acc, ratio = evaluate_chunk(chunk, prompt_eff, delayed_eff, maxb,
+                                        ds=params.IBDspacecut,
+                                        dt=params.IBDtimecut,
+                                        RN=params.radionuclides,
+                                        FN=params.fastneutrons,
+                                        signal=params.signal)
+            arrays = list(chunk.T) if write_activities else []
+            writer.write(arrays + [acc, ratio])
+            nrows += chunk.shape[0]
+    finally:
+        writer.close()
+    return nrows
@@ -0,0 +1,114 @@
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple, Union
+
+from .component import Component
+
+# Immutable view of the detector state. Snapshots never change once built,
+# so any number of threads can evaluate what-if scenarios against the same
+# base without locks. Edits return a new snapshot that shares every
+# unchanged component (and all efficiency tables) with its parent.
+
+
+def _freeze(mapping: Mapping) -> Mapping:
+    return MappingProxyType({key: (_freeze(value) if isinstance(value, dict)
+                                   else value)
+                             for key, value in mapping.items()})
+
+
+def _singles_totals(activities: Mapping, efficiencies: Mapping):
+    # Same summation order as Component.calculate_singles
+    tot_singles = 0.
+    del_singles = 0.
+    for iso, act in activities.items():
+        for eff in efficiencies[iso].values():
+            tot_singles += eff[0] * act
+            del_singles += eff[1] * act
+    return tot_singles, del_singles
+
+
+class ComponentState(NamedTuple):
+    name: str
+    mass: float
+    rate_format: str
+    activities: Mapping[str, float]
+    efficiencies: Mapping[str, Mapping[str, Tuple[float, float]]]
+    total_singles: float
+    del_singles: float
+
+    @classmethod
+    def from_component(cls, comp: Component) -> "ComponentState":
+        # Component must have been updated so efficiencies are filled
+        activities = _freeze(comp.activities)
+        efficiencies = _freeze(comp.efficiencies)
+        return cls(comp.name, comp.mass, comp.rate_format, activities,
+                   efficiencies, *_singles_totals(activities, efficiencies))
+
+    def with_activity(self, iso: str, activity: float) -> "ComponentState":
+        if iso not in self.activities:
+            raise KeyError(f"{iso} not in {self.name}")
+        activities = dict(self.activities)
+        activities[iso] = activity
+        activities = MappingProxyType(activities)
+        tot_singles, del_singles = _singles_totals(
+            activities, self.efficiencies)
+        return self._replace(activities=activities,
+                             total_singles=tot_singles,
+                             del_singles=del_singles)
+
+    @property
+    def isotopes(self) -> Tuple[str, ...]:
+        return tuple(self.activities)
+
+    def singles(self, iso: str) -> Mapping[str, Tuple[float, float]]:
+        act = self.activities[iso]
+        return {ciso: (eff[0] * act, eff[1] * act)
+                for ciso, eff in self.efficiencies[iso].items()}
+
+
+class Snapshot():
+    __slots__ = ("_components",)
+
+    def __init__(self, components: Tuple[ComponentState, ...]):
+        object.__setattr__(self, "_components", tuple(components))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is immutable")
+
+    @property
+    def components(self) -> Tuple[ComponentState, ...]:
+        return self._components
+
+    @classmethod
+    def from_components(cls, components) -> "Snapshot":
+        return cls(tuple(ComponentState.from_component(comp)
+                         for comp in components))
+
+    def index(self, name: str) -> int:
+        names = [comp.name.lower() for comp in self.components]
+        return names.index(name.lower())
+
+    def with_activity(
+            self, comp: Union[int, str], iso: str, activity: float
+    ) -> "Snapshot":
+        idx = comp if isinstance(comp, int) else self.index(comp)
+        comps = list(self.components)
+        comps[idx] = comps[idx].with_activity(iso, activity)
+        return Snapshot(tuple(comps))
+
+    def scale_activity(
+            self, comp: Union[int, str], iso: str, factor: float
+    ) -> "Snapshot":
+        idx = comp if isinstance(comp, int) else self.index(comp)
+        act = self.components[idx].activities[iso]
+        return self.with_activity(idx, iso, act * factor)
+
+    def __iter__(self):
+        # Iterating a snapshot yields its components, so it can be passed
+        # anywhere a list of components is expected by the budget functions.
+        return iter(self.components)
+
+    def __len__(self):
+        return len(self.components)
+
+    def __repr__(self):
+        return f"Snapshot ({', '.join(c.name for c in self.components)})"